@@ -120,6 +120,11 @@ class ActionModule(ActionBase):
         socket_path = getattr(self._connection, 'socket_path') or task_vars.get('ansible_socket')
         connection = Connection(socket_path)
 
+        # this is needed so the strategy plugin can identify the connection as
+        # a persistent connection and track it, otherwise the connection will
+        # not be closed at the end of the play
+        self._task.args['_ansible_socket'] = socket_path
+
         # make command a required argument
         if not command:
             raise AnsibleError('missing required argument `command`')
@@ -131,28 +136,33 @@ class ActionModule(ActionBase):
 
         result['stdout'] = output
 
-        # try to convert the cli output to native json
-        try:
-            json_data = json.loads(output)
-        except Exception:
-            json_data = None
+        # try to convert the cli output to native json, most command output
+        # is plain text so only attempt it when the output looks like json
+        json_data = None
+        if output and output.lstrip()[:1] in ('{', '['):
+            try:
+                json_data = json.loads(output)
+            except Exception:
+                pass
 
         result['json'] = json_data
 
-        if parser:
-            if engine not in ('command_parser', 'textfsm_parser'):
-                raise AnsibleError('missing or invalid value for argument engine')
+        if parser and engine not in ('command_parser', 'textfsm_parser'):
+            raise AnsibleError('missing or invalid value for argument engine')
 
-            new_task = self._task.copy()
-            new_task.args = {
+        if parser:
+            # the parser engine only reads the task args so it is handed this
+            # task with its args swapped out, rather than a copy of the task
+            task_args = self._task.args
+            self._task.args = {
                 'file': parser,
-                'content': (json_data or output)
+                'content': json_data or output
             }
             if engine == 'textfsm_parser':
-                new_task.args.update({'name': name})
+                self._task.args.update({'name': name})
 
             kwargs = {
-                'task': new_task,
+                'task': self._task,
                 'connection': self._connection,
                 'play_context': self._play_context,
                 'loader': self._loader,
@@ -160,15 +170,16 @@ class ActionModule(ActionBase):
                 'shared_loader_obj': self._shared_loader_obj
             }
 
-            task_parser = self._shared_loader_obj.action_loader.get(engine, **kwargs)
-            result.update(task_parser.run(task_vars=task_vars))
-
-        self._remove_tmp_path(self._connection._shell.tmpdir)
-
-        # this is needed so the strategy plugin can identify the connection as
-        # a persistent connection and track it, otherwise the connection will
-        # not be closed at the end of the play
-        socket_path = getattr(self._connection, 'socket_path') or task_vars.get('ansible_socket')
-        self._task.args['_ansible_socket'] = socket_path
+            try:
+                task_parser = self._shared_loader_obj.action_loader.get(engine, **kwargs)
+                result.update(task_parser.run(task_vars=task_vars))
+            finally:
+                self._task.args = task_args
+
+        # plain cli tasks never transfer files so usually there is no remote
+        # tmp dir to clean up
+        tmpdir = getattr(self._connection._shell, 'tmpdir', None)
+        if tmpdir:
+            self._remove_tmp_path(tmpdir)
 
         return result
@@ -9,11 +9,10 @@ __metaclass__ = type
 
 import os
 import sys
-import collections
 
 from ansible import constants as C
 from ansible.plugins.action import ActionBase
-from ansible.module_utils.common._collections_compat import Mapping
+from ansible.module_utils.common._collections_compat import Iterable, Mapping
 from ansible.module_utils.six import iteritems, string_types
 from ansible.module_utils._text import to_text
 from ansible.errors import AnsibleError
@@ -31,20 +30,56 @@ from network_engine.utils import dict_merge, generate_source_path
 
 display = Display()
 
+try:
+    from os import scandir
+except ImportError:
+    # python 2 has no scandir in the standard library
+    scandir = None
+
+# directory listings keyed by (path, mtime) so that parser directories are
+# only read again once their contents change
+_DIR_CACHE = {}
+
 
 def warning(msg):
     if C.ACTION_WARNINGS:
         display.warning(msg)
 
 
+def list_dir(path):
+    """ Return a list of (name, is_file) tuples for the entries in path
+    """
+    key = (path, os.stat(path).st_mtime)
+    try:
+        return _DIR_CACHE[key]
+    except KeyError:
+        pass
+
+    if scandir is not None:
+        entries = [(entry.name, entry.is_file()) for entry in scandir(path)]
+    else:
+        entries = [(name, os.path.isfile(os.path.join(path, name))) for name in os.listdir(path)]
+
+    _DIR_CACHE[key] = entries
+    return entries
+
+
 class ActionModule(ActionBase):
 
     VALID_FILE_EXTENSIONS = ('.yaml', '.yml', '.json')
-    VALID_GROUP_DIRECTIVES = ('pattern_group', 'block')
-    VALID_ACTION_DIRECTIVES = ('parser_metadata', 'pattern_match', 'set_vars', 'json_template')
-    VALID_DIRECTIVES = VALID_GROUP_DIRECTIVES + VALID_ACTION_DIRECTIVES
+    VALID_GROUP_DIRECTIVES = frozenset(('pattern_group', 'block'))
+    VALID_ACTION_DIRECTIVES = frozenset(('parser_metadata', 'pattern_match', 'set_vars', 'json_template'))
+    VALID_DIRECTIVES = VALID_GROUP_DIRECTIVES | VALID_ACTION_DIRECTIVES
     VALID_EXPORT_AS = ('list', 'elements', 'dict', 'object', 'hash')
 
+    # options consumed by do_pattern_group for each entry in the group
+    PATTERN_GROUP_OPTIONS = frozenset(('name', 'register', 'when', 'loop', 'loop_control'))
+
+    # maps each directive to the name of the method that implements it,
+    # `block` is handled as `pattern_group` so it has no method of its own
+    DIRECTIVE_METHODS = dict((directive, 'do_%s' % directive)
+                             for directive in VALID_DIRECTIVES - frozenset(('block',)))
+
     def run(self, tmp=None, task_vars=None):
         if task_vars is None:
             task_vars = dict()
@@ -91,6 +126,11 @@ class ActionModule(ActionBase):
         facts = {}
 
         self.template = template_loader.get('json_template', self._templar)
+        self.parser_engine = parser_loader.get('pattern_match', class_only=True)
+
+        # resolve the directive methods once rather than for every directive
+        self._directive_methods = dict((directive, getattr(self, meth))
+                                       for directive, meth in iteritems(self.DIRECTIVE_METHODS))
 
         paths = self._task.get_search_path()
         for src in sources:
@@ -102,6 +142,7 @@ class ActionModule(ActionBase):
 
             self.ds = {'content': content}
             self.ds.update(task_vars)
+            self._content = None
 
             for task in tasks:
                 name = task.pop('name', None)
@@ -287,17 +328,15 @@ class ActionModule(ActionBase):
             if not os.path.isdir(source_dir):
                 raise AnsibleError('%s does not appear to be a valid directory' % source_dir)
 
-            for filename in os.listdir(source_dir):
+            for filename, is_file in list_dir(source_dir):
                 fn, fext = os.path.splitext(filename)
                 if fn not in _processed:
                     _processed.add(fn)
 
-                    filename = os.path.join(source_dir, filename)
-
-                    if not os.path.isfile(filename) or fext not in self.VALID_FILE_EXTENSIONS:
+                    if not is_file or fext not in self.VALID_FILE_EXTENSIONS:
                         continue
                     else:
-                        include_files.append(filename)
+                        include_files.append(os.path.join(source_dir, filename))
 
         return include_files
 
@@ -315,31 +354,33 @@ class ActionModule(ActionBase):
         registers = {}
 
         for entry in block:
-            task = entry.copy()
-
-            name = task.pop('name', None)
+            name = entry.get('name')
             display.vvv("command_parser: starting pattern_match [%s] in pattern_group" % name)
 
-            register = task.pop('register', None)
+            register = entry.get('register')
 
-            when = task.pop('when', None)
+            when = entry.get('when')
             if when is not None:
                 if not self._check_conditional(when, self.ds):
                     warning('skipping task due to conditional check failure')
                     continue
 
-            loop = task.pop('loop', None)
+            loop = entry.get('loop')
             if loop:
                 loop = self.template(loop, self.ds)
 
-            loop_var = task.pop('loop_control', {}).get('loop_var') or 'item'
+            loop_var = entry.get('loop_control', {}).get('loop_var') or 'item'
             display.vvvv('command_parser: loop_var is %s' % loop_var)
 
+            # options are read from the entry directly, only the directive
+            # itself is handed on
+            task = dict((k, v) for k, v in iteritems(entry) if k not in self.PATTERN_GROUP_OPTIONS)
+
             if not set(task).issubset(('pattern_group', 'pattern_match')):
                 raise AnsibleError('invalid directive specified')
 
             if 'pattern_group' in task:
-                if loop and isinstance(loop, collections.Iterable) and not isinstance(loop, string_types):
+                if loop and isinstance(loop, Iterable) and not isinstance(loop, string_types):
                     res = list()
                     for loop_item in loop:
                         self.ds[loop_var] = loop_item
@@ -352,7 +393,7 @@ class ActionModule(ActionBase):
                 if register:
                     registers[register] = res
 
-            elif isinstance(loop, collections.Iterable) and not isinstance(loop, string_types):
+            elif isinstance(loop, Iterable) and not isinstance(loop, string_types):
                 loop_result = list()
 
                 for loop_item in loop:
@@ -379,18 +420,15 @@ class ActionModule(ActionBase):
                 display.deprecated('`block` is not longer supported, use `pattern_group` instead', version=2.6)
                 directive = 'pattern_group'
 
-            if directive not in self.VALID_DIRECTIVES:
+            try:
+                meth = self._directive_methods[directive]
+            except KeyError:
                 raise AnsibleError('invalid directive in parser: %s' % directive)
 
-            meth = getattr(self, 'do_%s' % directive)
-
-            if meth:
-                if directive in self.VALID_GROUP_DIRECTIVES:
-                    return meth(args)
-                elif directive in self.VALID_ACTION_DIRECTIVES:
-                    return meth(**args)
+            if directive in self.VALID_GROUP_DIRECTIVES:
+                return meth(args)
             else:
-                raise AnsibleError('invalid directive: %s' % directive)
+                return meth(**args)
 
     def do_parser_metadata(self, version=None, command=None, network_os=None):
         if version:
@@ -400,11 +438,23 @@ class ActionModule(ActionBase):
             raise AnsibleError('parser expected %s, got %s' % (network_os, self.ds['ansible_network_os']))
 
     def do_pattern_match(self, regex, content=None, match_all=None, match_until=None, match_greedy=None):
-        content = self.template(content, self.ds) or self.template("{{ content }}", self.ds)
+        if content is not None:
+            content = self.template(content, self.ds)
+        if not content:
+            content = self._get_content()
+
         regex = self.template(regex, self.ds)
-        parser = parser_loader.get('pattern_match', content)
+        parser = self.parser_engine(content)
         return parser.match(regex, match_all, match_until, match_greedy)
 
+    def _get_content(self):
+        # the task content is the default for every pattern_match so only
+        # template it again if it has been replaced since the last call
+        value = self.ds.get('content')
+        if self._content is None or self._content[0] is not value:
+            self._content = (value, self.template("{{ content }}", self.ds))
+        return self._content[1]
+
     def do_json_template(self, template):
         return self.template.run(template, self.ds)
 
@@ -412,5 +462,8 @@ class ActionModule(ActionBase):
         return self.template(kwargs, self.ds)
 
     def _check_conditional(self, when, variables):
+        # `when: yes` and `when: no` are loaded as booleans already
+        if isinstance(when, bool):
+            return when
         conditional = "{%% if %s %%}True{%% else %%}False{%% endif %%}"
         return self.template(conditional % when, variables)
@@ -9,6 +9,8 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import os
+
 from ansible.module_utils.six import StringIO, string_types
 
 from ansible.plugins.action import ActionBase
@@ -20,6 +22,12 @@ try:
 except ImportError:
     HAS_TEXTFSM = False
 
+# compiled TextFSM templates, keyed by (file, mtime) or by the template
+# source.  Stale mtimes and templated sources are never looked up again so
+# the cache is bounded like the pattern cache, by starting over once full
+TEMPLATE_CACHE = {}
+TEMPLATE_CACHE_MAX = 512
+
 
 class ActionModule(ActionBase):
 
@@ -50,15 +58,8 @@ class ActionModule(ActionBase):
             if not isinstance(content, string_types):
                 return {'failed': True, 'msg': '`content` must be of type str, got %s' % type(content)}
 
-            if filename:
-                tmpl = open(filename)
-            else:
-                tmpl = StringIO()
-                tmpl.write(src.strip())
-                tmpl.seek(0)
-
             try:
-                re_table = textfsm.TextFSM(tmpl)
+                re_table = self._get_template(filename, src)
                 fsm_results = re_table.ParseText(content)
 
             except Exception as exc:
@@ -79,3 +80,29 @@ class ActionModule(ActionBase):
             self._remove_tmp_path(self._connection._shell.tmpdir)
 
         return result
+
+    def _get_template(self, filename, src):
+        """ Return a compiled TextFSM template ready to parse new content
+
+        Compiling a template is far more expensive than running it, so the
+        compiled object is cached and only reset between uses.
+        """
+        if filename:
+            key = (filename, os.path.getmtime(filename))
+        else:
+            key = src.strip()
+
+        re_table = TEMPLATE_CACHE.get(key)
+        if re_table is None:
+            if filename:
+                with open(filename) as tmpl:
+                    re_table = textfsm.TextFSM(tmpl)
+            else:
+                re_table = textfsm.TextFSM(StringIO(key))
+            if len(TEMPLATE_CACHE) >= TEMPLATE_CACHE_MAX:
+                TEMPLATE_CACHE.clear()
+            TEMPLATE_CACHE[key] = re_table
+        else:
+            re_table.Reset()
+
+        return re_table
@@ -11,8 +11,13 @@ from ansible.module_utils.six import string_types
 from ansible.errors import AnsibleFilterError
 
 
+# split a value into its leading name and the index that follows it
+INTERFACE_RE = re.compile(r'([A-Za-z\-]*)(.+)')
+PREFIX_RE = re.compile(r'([A-Za-z]*)(.+)')
+
+
 def interface_split(interface, key=None):
-    match = re.match(r'([A-Za-z\-]*)(.+)', interface)
+    match = INTERFACE_RE.match(interface)
     if not match:
         raise AnsibleFilterError('unable to parse interface %s' % interface)
     obj = {'name': match.group(1), 'index': match.group(2)}
@@ -31,7 +36,7 @@ def interface_range(interface):
         prefix = '%s/' % parts[0]
         index = parts[2]
     else:
-        match = re.match(r'([A-Za-z]*)(.+)', interface)
+        match = PREFIX_RE.match(interface)
         if not match:
             raise AnsibleFilterError('unable to parse interface %s' % interface)
         prefix = match.group(1)
@@ -47,9 +52,7 @@ def interface_range(interface):
 
         elif len(tokens) == 2:
             start, end = tokens
-            for i in range(int(start), int(end) + 1):
-                indicies.append(i)
-                i += 1
+            indicies.extend(range(int(start), int(end) + 1))
 
     return ['%s%s' % (prefix, index) for index in indicies]
 
@@ -79,7 +82,7 @@ def vlan_expand(vlan):
     if not isinstance(vlan, string_types):
         raise AnsibleFilterError('value must be of type string, got %s' % type(vlan))
 
-    match = re.match(r'([A-Za-z]*)(.+)', vlan)
+    match = PREFIX_RE.match(vlan)
     if not match:
         raise AnsibleFilterError('unable to parse vlan %s' % vlan)
 
@@ -94,9 +97,7 @@ def vlan_expand(vlan):
 
         elif len(tokens) == 2:
             start, end = tokens
-            for i in range(int(start), int(end) + 1):
-                indices.append(i)
-                i += 1
+            indices.extend(range(int(start), int(end) + 1))
 
     return ['%d' % int(index) for index in indices]
 
@@ -7,15 +7,108 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import os
 import re
 
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.module_utils.six import iteritems
 
+try:
+    import re2
+    RE2_OPTIONS = re2.Options()
+    RE2_OPTIONS.log_errors = False
+    HAS_RE2 = True
+except (ImportError, AttributeError):
+    HAS_RE2 = False
+
+# re2 differs from re for some patterns it accepts (\w, \d, \s and \b are
+# ASCII only, a{,3} is a literal) so it is only used when asked for
+USE_RE2 = HAS_RE2 and boolean(os.environ.get('NETWORK_ENGINE_USE_RE2', False), strict=False)
+
+# compiled patterns keyed by (pattern, flags).  Patterns are often templated
+# per loop item so the cache is bounded the same way the re module bounds its
+# own cache, by starting over once it is full
+_PATTERN_CACHE = {}
+_PATTERN_CACHE_MAX = 512
+
+# patterns without any of these are plain strings
+_META_CHARS_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
 
 def get_value(m, i):
     return m.group(i) if m else None
 
 
+def compile_pattern(pattern, flags=re.M):
+    """ Compile pattern with the re module or, when enabled, with re2
+
+    re2 is used when NETWORK_ENGINE_USE_RE2 is set on the controller.
+    Patterns that re2 cannot handle (backreferences, lookaround, ...) and
+    flags other than re.M are compiled with the re module instead.
+    """
+    key = (pattern, flags)
+    try:
+        return _PATTERN_CACHE[key]
+    except KeyError:
+        pass
+
+    if len(_PATTERN_CACHE) >= _PATTERN_CACHE_MAX:
+        _PATTERN_CACHE.clear()
+
+    regex = None
+    if USE_RE2 and flags in (0, re.M):
+        try:
+            regex = re2.compile('(?m)' + pattern if flags else pattern, RE2_OPTIONS)
+        except Exception:
+            # other modules are installed as re2 too, so anything they
+            # raise falls back to the re module
+            pass
+
+    if regex is None:
+        regex = re.compile(pattern, flags)
+
+    _PATTERN_CACHE[key] = regex
+    return regex
+
+
+def compile_anchor(pattern):
+    """ Compile a section anchor for use with _get_section_range
+
+    Anchors are often plain strings such as 'interface ' which are found
+    with str.find rather than the regular expression engine.
+    """
+    if _META_CHARS_RE.search(pattern):
+        return compile_pattern(pattern)
+    return LiteralPattern(pattern)
+
+
+class LiteralMatch(object):
+
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+
+class LiteralPattern(object):
+    """ Implements the search method of a compiled pattern for plain strings
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    def search(self, string, pos=0):
+        idx = string.find(self.text, pos)
+        if idx < 0:
+            return None
+        return LiteralMatch(idx, idx + len(self.text))
+
+
 class ParserEngine(object):
 
     def __init__(self, text):
@@ -62,8 +155,19 @@ class ParserEngine(object):
         section_data = list()
 
         if match_all:
+            # scan forward from an offset rather than slicing off the matched
+            # section, which would copy the remaining content every iteration
+            start_re = compile_anchor(start)
+            if end:
+                end_re = compile_anchor(end)
+                include_end = True
+            else:
+                end_re = start_re
+                include_end = False
+
+            pos = 0
             while True:
-                section_range = self._get_section_range(content, start, end)
+                section_range = self._get_section_range(content, start_re, end_re, include_end, pos)
                 if not section_range:
                     break
 
@@ -71,7 +175,7 @@ class ParserEngine(object):
 
                 if eidx is not None:
                     section_data.append(content[sidx: eidx])
-                    content = content[eidx:]
+                    pos = eidx
                 else:
                     section_data.append(content[sidx:])
                     break
@@ -81,64 +185,39 @@ class ParserEngine(object):
 
         return section_data
 
-    def _get_section_range(self, content, start, end=None):
+    def _get_section_range(self, content, start_re, end_re, include_end, pos=0):
+        """ Find the next section of content starting at pos
 
-        context_start_re = re.compile(start, re.M)
-        if end:
-            context_end_re = re.compile(end, re.M)
-            include_end = True
-        else:
-            context_end_re = context_start_re
-            include_end = False
+        :args content: The content to search
+        :args start_re: The compiled pattern that starts a section
+        :args end_re: The compiled pattern that ends a section
+        :args include_end: Whether the match of end_re is part of the section
+        :args pos: The offset in content to start searching from
 
-        context_start = re.search(context_start_re, content)
+        :returns: tuple of (start, end) offsets, end is None when the section
+            runs to the end of content, or None when there is no section
+        """
+        context_start = start_re.search(content, pos)
         if not context_start:
             return
 
         string_start = context_start.start()
         end = context_start.end() + 1
 
-        context_end = re.search(context_end_re, content[end:])
+        context_end = end_re.search(content, end)
         if not context_end:
             return (string_start, None)
 
         if include_end:
-            string_end = end + context_end.end()
+            string_end = context_end.end()
         else:
-            string_end = end + context_end.start()
+            string_end = context_end.start()
 
         return (string_start, string_end)
 
-    def _get_context_data(self, entry, content):
-        name = entry['name']
-
-        context = entry.get('context', {})
-        context_data = list()
-
-        if context:
-            while True:
-                context_range = self._get_context_range(name, context, content)
-
-                if not context_range:
-                    break
-
-                start, end = context_range
-
-                if end is not None:
-                    context_data.append(content[start: end])
-                    content = content[end:]
-                else:
-                    context_data.append(content[start:])
-                    break
-
-        else:
-            context_data.append(content)
-
-        return context_data
-
     def re_search(self, regex, value):
         obj = {'matches': []}
-        regex = re.compile(regex, re.M)
+        regex = compile_pattern(regex)
         match = regex.search(value)
         if match:
             items = list(match.groups())
@@ -150,15 +229,18 @@ class ParserEngine(object):
 
     def re_matchall(self, regex, value):
         objects = list()
-        regex = re.compile(regex)
-        for match in re.findall(regex.pattern, value, re.M):
-            obj = {}
-            obj['matches'] = match
+        regex = compile_pattern(regex)
+        groups = regex.groups
+        for match in regex.finditer(value):
+            # matches has the same shape findall would give: the whole match
+            # without groups, the group for a single group, otherwise a tuple
+            if groups > 1:
+                obj = {'matches': match.groups('')}
+            elif groups == 1:
+                obj = {'matches': match.group(1) or ''}
+            else:
+                obj = {'matches': match.group(0)}
             if regex.groupindex:
-                for name, index in iteritems(regex.groupindex):
-                    if len(regex.groupindex) == 1:
-                        obj[name] = match
-                    else:
-                        obj[name] = match[index - 1]
+                obj.update(match.groupdict(''))
             objects.append(obj)
         return objects
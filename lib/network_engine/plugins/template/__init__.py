@@ -7,12 +7,19 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import collections
-
-from ansible.module_utils.six import iteritems, string_types
+from ansible.module_utils.common._collections_compat import Iterable, Mapping
+from ansible.module_utils.six import integer_types, iteritems, string_types
 from ansible.errors import AnsibleUndefinedVariable
 
 
+def is_literal(data, convert_bare=False):
+    """ Return True if data is a string the templar would return unchanged
+    """
+    if not isinstance(data, string_types) or not data or convert_bare:
+        return False
+    return not ('{{' in data or '{%' in data or '{#' in data)
+
+
 class TemplateBase(object):
 
     def __init__(self, templar):
@@ -25,39 +32,70 @@ class TemplateBase(object):
         pass
 
     def template(self, data, variables, convert_bare=False):
+        if is_literal(data, convert_bare):
+            return data
+
+        # the available variables are swapped once for all of data rather
+        # than once for every value in it
+        tmp_avail_vars = self._templar._available_variables
+        self._templar.set_available_variables(variables)
+        try:
+            return self._template(data, convert_bare)
+        finally:
+            self._templar.set_available_variables(tmp_avail_vars)
+
+    def _template(self, data, convert_bare=False):
 
-        if isinstance(data, collections.Mapping):
+        # strings are by far the most common values so they are checked
+        # first, and the concrete types before the slower ABC checks
+        if isinstance(data, string_types):
+            if is_literal(data, convert_bare):
+                return data
+
+        elif data and isinstance(data, (bool, float) + integer_types):
+            # numbers and booleans have nothing to template
+            return data
+
+        elif isinstance(data, (dict, Mapping)):
             templated_data = {}
+            changed = False
             for key, value in iteritems(data):
-                templated_key = self.template(key, variables, convert_bare=convert_bare)
-                templated_value = self.template(value, variables, convert_bare=convert_bare)
+                templated_key = self._template(key, convert_bare=convert_bare)
+                templated_value = self._template(value, convert_bare=convert_bare)
                 templated_data[templated_key] = templated_value
+                changed = changed or templated_key is not key or templated_value is not value
+            # hand back the original object when nothing in it was templated
+            if not changed and isinstance(data, dict):
+                return data
+            return templated_data
+
+        elif isinstance(data, (list, tuple, Iterable)):
+            templated_data = [self._template(i, convert_bare=convert_bare) for i in data]
+            if isinstance(data, list) and all(new is old for new, old in zip(templated_data, data)):
+                return data
             return templated_data
 
-        elif isinstance(data, collections.Iterable) and not isinstance(data, string_types):
-            return [self.template(i, variables, convert_bare=convert_bare) for i in data]
-
-        else:
-            data = data or {}
-            tmp_avail_vars = self._templar._available_variables
-            self._templar.set_available_variables(variables)
-            try:
-                resp = self._templar.template(data, convert_bare=convert_bare)
-            except AnsibleUndefinedVariable:
-                resp = None
-                pass
-            finally:
-                self._templar.set_available_variables(tmp_avail_vars)
-            return resp
+        data = data or {}
+        try:
+            return self._templar.template(data, convert_bare=convert_bare)
+        except AnsibleUndefinedVariable:
+            return None
 
     def _update(self, d, u):
+        # d may be a value from the template itself, which template() hands
+        # back unchanged when it has nothing to template, so it is copied
+        # rather than updated in place
+        d = dict(d)
         for k, v in iteritems(u):
-            if isinstance(v, collections.Mapping):
+            if isinstance(v, (dict, Mapping)):
                 d[k] = self._update(d.get(k, {}), v)
             else:
                 d[k] = v
         return d
 
     def _check_conditional(self, when, variables):
+        # `when: yes` and `when: no` are loaded as booleans already
+        if isinstance(when, bool):
+            return when
         conditional = "{%% if %s %%}True{%% else %%}False{%% endif %%}"
         return self.template(conditional % when, variables)
@@ -7,8 +7,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import collections
-
+from ansible.module_utils.common._collections_compat import Iterable
 from ansible.module_utils.six import string_types
 
 from network_engine.plugins.template import TemplateBase
@@ -48,7 +47,7 @@ class TemplateEngine(TemplateBase):
 
             if items:
                 if loop:
-                    if isinstance(loop_data, collections.Iterable) and not isinstance(loop_data, string_types):
+                    if isinstance(loop_data, Iterable) and not isinstance(loop_data, string_types):
                         templated_value = list()
 
                         for loop_item in loop_data:
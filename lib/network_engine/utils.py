@@ -10,13 +10,15 @@ from itertools import chain
 
 from ansible.module_utils.six import iteritems
 from ansible.module_utils._text import to_bytes, to_text
-from ansible.module_utils.network.common.utils import sort_list
 from ansible.utils.display import Display
 from ansible.utils.path import unfrackpath
 
 
 display = Display()
 
+# marks keys that are missing from a dict, None is a valid value
+_MISSING = object()
+
 
 def dict_merge(base, other):
     """ Return a new dict object that combines base and other
@@ -36,49 +38,36 @@ def dict_merge(base, other):
     if not isinstance(other, dict):
         raise AssertionError("`other` must be of type <dict>")
 
-    combined = dict()
-
-    for key, value in iteritems(base):
-        if isinstance(value, dict):
-            if key in other:
-                item = other.get(key)
-                if item is not None:
-                    if isinstance(other[key], dict):
-                        combined[key] = dict_merge(value, other[key])
-                    else:
-                        combined[key] = other[key]
-                else:
-                    combined[key] = item
+    # merging with an empty dict is just a copy of the other one
+    if not other:
+        return dict(base)
+    if not base:
+        return dict(other)
+
+    # start from a copy of base and only revisit the keys found in other
+    combined = dict(base)
+
+    for key, item in iteritems(other):
+        value = base.get(key, _MISSING)
+
+        if value is _MISSING or item is None:
+            combined[key] = item
+        elif isinstance(value, dict):
+            if isinstance(item, dict):
+                combined[key] = dict_merge(value, item)
             else:
-                combined[key] = value
+                combined[key] = item
         elif isinstance(value, list):
-            if key in other:
-                item = other.get(key)
-                if item is not None:
-                    try:
-                        combined[key] = list(set(chain(value, item)))
-                    except TypeError:
-                        value.extend([i for i in item if i not in value])
-                        combined[key] = value
-                else:
-                    combined[key] = item
-            else:
-                combined[key] = value
-        else:
-            if key in other:
-                other_value = other.get(key)
-                if other_value is not None:
-                    if sort_list(base[key]) != sort_list(other_value):
-                        combined[key] = other_value
-                    else:
-                        combined[key] = value
-                else:
-                    combined[key] = other_value
-            else:
-                combined[key] = value
-
-    for key in set(other.keys()).difference(base.keys()):
-        combined[key] = other.get(key)
+            try:
+                # dedupe in a single pass, keeping the order of the
+                # entries in base followed by the new ones in other
+                seen = set()
+                combined[key] = [i for i in chain(value, item) if not (i in seen or seen.add(i))]
+            except TypeError:
+                combined[key] = value + [i for i in item if i not in value]
+        elif value is not item and value != item:
+            # equal scalars keep the value from base
+            combined[key] = item
 
     return combined
 
@@ -112,7 +101,9 @@ def generate_source_path(paths, source):
 
         for candidate in search:
             display.vvvvv(u'looking for "%s" at "%s"' % (source, to_text(candidate)))
-            if os.path.exists(candidate) and os.path.isfile(candidate):
+            # isfile is False for paths that don't exist so this is a single
+            # stat per candidate
+            if os.path.isfile(candidate):
                 result = to_text(candidate)
                 break
 
@@ -39,10 +39,8 @@ class LookupModule(LookupBase):
         ret = super(LookupModule, self).run(terms, variables, **kwargs)
 
         omit = variables['omit']
-        filtered = list()
 
-        for line in ret[0].split('\n'):
-            if all((line, omit not in line, not line.startswith('!'))):
-                filtered.append(line)
+        # the conditions short circuit, so blank lines never get searched
+        filtered = [line for line in ret[0].split('\n') if line and omit not in line and not line.startswith('!')]
 
         return [filtered]
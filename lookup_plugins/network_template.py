@@ -35,15 +35,19 @@ _raw:
 """
 
 
-import collections
+import os
+import sys
 
 from ansible.plugins.lookup import LookupBase, display
-from ansible.module_utils.common._collections_compat import Mapping
+from ansible.module_utils.common._collections_compat import Iterable, Mapping
 from ansible.module_utils.network.common.utils import to_list
-from ansible.module_utils.six import iteritems, string_types
+from ansible.module_utils.six import integer_types, iteritems, string_types
 from ansible.module_utils._text import to_text, to_bytes
 from ansible.errors import AnsibleError, AnsibleUndefinedVariable
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.path.pardir, 'lib'))
+from network_engine.plugins.template import is_literal
+
 
 class LookupModule(LookupBase):
 
@@ -85,7 +89,7 @@ class LookupModule(LookupBase):
                                     if res:
                                         loop_result.extend(to_list(res))
 
-                            elif isinstance(loop, collections.Iterable) and not isinstance(loop, string_types):
+                            elif isinstance(loop, Iterable) and not isinstance(loop, string_types):
                                 for loop_item in loop:
                                     self.ds['item'] = loop_item
                                     res = self._process_directive(task)
@@ -140,7 +144,7 @@ class LookupModule(LookupBase):
                     loop_result.extend(to_list(self._process_directive(task)))
                 results.extend(loop_result)
 
-            elif isinstance(loop, collections.Iterable) and not isinstance(loop, string_types):
+            elif isinstance(loop, Iterable) and not isinstance(loop, string_types):
                 loop_result = list()
                 for loop_item in loop:
                     self.ds['item'] = loop_item
@@ -219,39 +223,80 @@ class LookupModule(LookupBase):
         return self.build([template_data], variables)
 
     def template(self, data, variables, convert_bare=False):
-
-        if isinstance(data, Mapping):
+        if is_literal(data, convert_bare):
+            return self._coerce_to_native(data)
+
+        # the available variables are swapped once for all of data rather
+        # than once for every value in it
+        tmp_avail_vars = self._templar._available_variables
+        self._templar.set_available_variables(variables)
+        try:
+            return self._template(data, convert_bare)
+        finally:
+            self._templar.set_available_variables(tmp_avail_vars)
+
+    def _template(self, data, convert_bare=False):
+
+        # strings are by far the most common values so they are checked
+        # first, and the concrete types before the slower ABC checks
+        if isinstance(data, string_types):
+            if is_literal(data, convert_bare):
+                return self._coerce_to_native(data)
+
+        elif data and isinstance(data, (bool, float) + integer_types):
+            # numbers and booleans have nothing to template
+            return self._coerce_to_native(data)
+
+        elif isinstance(data, (dict, Mapping)):
             templated_data = {}
+            changed = False
             for key, value in iteritems(data):
-                templated_key = self.template(key, variables, convert_bare=convert_bare)
-                templated_data[templated_key] = self.template(value, variables, convert_bare=convert_bare)
+                templated_key = self._template(key, convert_bare=convert_bare)
+                templated_value = self._template(value, convert_bare=convert_bare)
+                templated_data[templated_key] = templated_value
+                changed = changed or templated_key is not key or templated_value is not value
+            # hand back the original object when nothing in it was templated
+            if not changed and isinstance(data, dict):
+                return data
+            return templated_data
+
+        elif isinstance(data, (list, tuple, Iterable)):
+            templated_data = [self._template(i, convert_bare=convert_bare) for i in data]
+            if isinstance(data, list) and all(new is old for new, old in zip(templated_data, data)):
+                return data
             return templated_data
 
-        elif isinstance(data, collections.Iterable) and not isinstance(data, string_types):
-            return [self.template(i, variables, convert_bare=convert_bare) for i in data]
-
-        else:
-            data = data or {}
-            tmp_avail_vars = self._templar._available_variables
-            self._templar.set_available_variables(variables)
-            try:
-                resp = self._templar.template(data, convert_bare=convert_bare)
-                resp = self._coerce_to_native(resp)
-            except AnsibleUndefinedVariable:
-                resp = None
-            finally:
-                self._templar.set_available_variables(tmp_avail_vars)
-            return resp
+        data = data or {}
+        try:
+            return self._coerce_to_native(self._templar.template(data, convert_bare=convert_bare))
+        except AnsibleUndefinedVariable:
+            return None
 
     def _coerce_to_native(self, value):
-        if not isinstance(value, bool):
-            try:
-                value = int(value)
-            except Exception:
-                if value is None or len(value) == 0:
-                    return None
+        if value is None or isinstance(value, bool):
+            return value
+
+        if isinstance(value, string_types):
+            if not value:
+                return None
+            # only strings that look like an integer are worth an attempt
+            # at conversion, raising and catching the error is expensive
+            digits = value.strip()
+            if digits[:1] in ('-', '+'):
+                digits = digits[1:]
+            if not digits.replace('_', '').isdigit():
+                return value
+
+        try:
+            value = int(value)
+        except Exception:
+            if len(value) == 0:
+                return None
         return value
 
     def _check_conditional(self, when, variables):
+        # `when: yes` and `when: no` are loaded as booleans already
+        if isinstance(when, bool):
+            return when
         conditional = "{%% if %s %%}True{%% else %%}False{%% endif %%}"
         return self.template(conditional % when, variables)